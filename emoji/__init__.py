@@ -2,38 +2,619 @@
 # Copyright (c) 2024 Manuel Schneider
 
 import json
+import os
 import re
+import sys
 import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+import urllib.error
 import urllib.request
-import builtins
 from locale import getdefaultlocale
 from pathlib import Path
 
 from albert import *
 
 md_iid = "3.0"
-md_version = "3.1"
+md_version = "3.2"
 md_name = "Emoji"
 md_description = "Find and copy emojis by name"
 md_license = "MIT"
 md_url = "https://github.com/albertlauncher/python/tree/main/emoji"
 md_authors = "@manuelschneid3r"
 
+# Bump whenever the table layout or the alias computation changes
+SNAPSHOT_VERSION = 5
+
+# Upper bound of concurrent annotation downloads/parses
+MAX_LOCALE_WORKERS = 4
+
+# Delay of the first and interval of subsequent upstream data update checks (seconds)
+REFRESH_DELAY = 60
+REFRESH_INTERVAL = 24 * 3600
+
+SKIN_TONES = [
+    'light skin tone',
+    'medium-light skin tone',
+    'medium skin tone',
+    'medium-dark skin tone',
+    'dark skin tone',
+]
+
+
+class BuildCancelled(Exception):
+    """Raised at the cancellation checkpoints of a superseded index build"""
+
+
+def check_cancelled(cancel: threading.Event):
+    if cancel is not None and cancel.is_set():
+        raise BuildCancelled()
+
+
+def write_file_atomically(path: Path, data: bytes):
+    # unique per thread, superseded builds may still be writing
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with tmp_path.open('wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def download_file(url: str, path: Path, timeout: float = 3) -> bool:
+    """Downloads url to path, conditionally if path exists
+
+    ETag and Last-Modified of the response are stored next to the file and
+    sent along with subsequent requests. Returns whether the content of path
+    changed.
+    """
+    headers = {'User-Agent': 'Mozilla/5.0'}  # otherwise github returns html
+    headers_path = path.with_name(f'{path.name}.headers.json')
+    if path.is_file():
+        try:
+            cached_headers = json.loads(headers_path.read_text())
+        except (OSError, ValueError):
+            cached_headers = {}
+        if etag := cached_headers.get('etag'):
+            headers['If-None-Match'] = etag
+        if last_modified := cached_headers.get('last_modified'):
+            headers['If-Modified-Since'] = last_modified
+
+    debug(f"Downloading {url}.")
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.getcode() != 200:
+                raise RuntimeError(f"Failed to download {url}. Status code: {response.getcode()}")
+            data = response.read()
+            cached_headers = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            debug(f"{url} not modified.")
+            return False
+        raise
+
+    changed = not path.is_file() or path.read_bytes() != data
+    if changed:
+        debug(f"Success. Storing to {path}.")
+        write_file_atomically(path, data)
+    write_file_atomically(headers_path, json.dumps(cached_headers).encode())
+    return changed
+
+
+def get_locale() -> str:
+    if lang := getdefaultlocale()[0]:
+        return lang[0:2]
+    else:
+        warning("Failed getting locale. There will be no localized emoji aliases.")
+        return 'en'
+
+
+def parse_locales(value: str) -> list:
+    """Returns the deduplicated locales of a list like 'en, de, ja'"""
+    locales = []
+    for lang in re.split(r'[\s,;+]+', value):
+        if lang and lang not in locales:
+            locales.append(lang)
+    return locales
+
+
+def emoji_list_source(cache_path: Path) -> tuple:
+    """Returns the (url, path) of the emoji list"""
+    return 'https://unicode.org/Public/emoji/latest/emoji-test.txt', cache_path / 'emoji_list.txt'
+
+
+def annotations_source(cache_path: Path, lang: str, derived: bool) -> tuple:
+    """Returns the (url, path) of the localized CLDR annotations"""
+    if derived:
+        return 'https://raw.githubusercontent.com/unicode-org/cldr-json/main/cldr-json/' \
+               'cldr-annotations-derived-full/annotationsDerived/%s/annotations.json' % lang, \
+               cache_path / f'emoji_annotations_derived_{lang}.json'
+    else:
+        return 'https://raw.githubusercontent.com/unicode-org/cldr-json/main/cldr-json/' \
+               'cldr-annotations-full/annotations/%s/annotations.json' % lang, \
+               cache_path / f'emoji_annotations_full_{lang}.json'
+
+
+def fetch_emoji_list(cache_path: Path) -> Path:
+    url, path = emoji_list_source(cache_path)
+    if not path.is_file():
+        info("Fetching emoji list.")
+        download_file(url, path)
+    return path
+
+
+def fetch_annotations(cache_path: Path, lang: str, derived: bool) -> Path:
+    url, path = annotations_source(cache_path, lang, derived)
+    if not path.is_file():
+        download_file(url, path)
+    return path
+
+
+def get_fully_qualified_emojis(path: Path, cancel: threading.Event = None) -> tuple:
+    """Returns the fully qualified base emojis and a dict mapping base emojis to their variants
+
+    Emojis whose modifier has skin tones (e.g. 'man: light skin tone, red hair') are
+    considered variants of the emoji named without them (e.g. 'man: red hair').
+    Other modifiers (e.g. 'person: blond hair') name emojis of their own.
+    Variants are lists of (emoji, modifier) tuples.
+    """
+
+    def convert_to_unicode_char(hex_code: str):
+        return chr(int(hex_code, 16))
+
+    def convert_to_unicode_str(hex_codes: str):
+        hex_list = hex_codes.split()
+        return ''.join([convert_to_unicode_char(hex_code) for hex_code in hex_list])
+
+    # components = set()
+    fully_qualified = []  # (emoji, name, modifier)
+
+    with path.open("r") as f:
+
+        emoji_list_re_str = r"""
+                 ^
+                 (?P<codepoints> .*\S)
+                 \s*;\s*
+                 (?P<status> \S+)
+                 \s*\#\s*
+                 (?P<emoji> \S+)
+                 \s*
+                 (?P<version> E\d+.\d+)
+                 \s*
+                 (?P<name> [^:]+)
+                 (?: : \s* (?P<modifier> .+))?
+                 \n
+                 $
+                 """
+
+        line_re = re.compile(emoji_list_re_str, re.VERBOSE)
+        for line in f:
+            check_cancelled(cancel)
+            if match := line_re.match(line):
+                if match.group("status") == "fully-qualified":
+                    fully_qualified.append((convert_to_unicode_str(match.group("codepoints")),
+                                            match.group("name").strip(),
+                                            match.group("modifier")))
+
+    def split_modifier(name: str, modifier: str):
+        """Returns the name of the base emoji and the skin tones of the modifier"""
+        parts = [part.strip() for part in modifier.split(',')] if modifier else []
+        others = [part for part in parts if part not in SKIN_TONES]
+        tones = [part for part in parts if part in SKIN_TONES]
+        return f"{name}: {', '.join(others)}" if others else name, tones
+
+    emojis_by_name = {}
+    for emoji, name, modifier in fully_qualified:
+        base_name, tones = split_modifier(name, modifier)
+        if not tones:
+            emojis_by_name.setdefault(base_name, emoji)
+
+    bases = []
+    variants = {}
+    for emoji, name, modifier in fully_qualified:
+        base_name, tones = split_modifier(name, modifier)
+        if tones and (base := emojis_by_name.get(base_name)) is not None:
+            variants.setdefault(base, []).append((emoji, ', '.join(tones)))
+        else:
+            bases.append(emoji)
+
+    return bases, variants
+
+
+def get_annotations(path_full: Path, path_derived: Path = None) -> dict:
+
+    with path_full.open("r", encoding='utf-8') as file_full:
+        json_full = json.load(file_full)['annotations']['annotations']
+
+    if path_derived is None:
+        return json_full
+
+    with path_derived.open("r", encoding='utf-8') as file_derived:
+        json_derived = json.load(file_derived)['annotationsDerived']['annotations']
+        return json_full | json_derived
+
+
+def remove_redundancy(sentences):
+    """Drops sentences whose words are all prefixes of words of another, different sentence"""
+
+    sets_of_words = [frozenset(sentence.lower().split()) for sentence in sentences]
+
+    # Flattened prefix trie. Maps every prefix of every word to the bitmask of
+    # the sentences having a word with that prefix.
+    prefix_masks = {}
+    same_masks = {}
+    for i, sow in enumerate(sets_of_words):
+        bit = 1 << i
+        same_masks[sow] = same_masks.get(sow, 0) | bit
+        for word in sow:
+            for end in range(1, len(word) + 1):
+                prefix = word[:end]
+                prefix_masks[prefix] = prefix_masks.get(prefix, 0) | bit
+
+    all_mask = (1 << len(sentences)) - 1
+    unique = []
+    for sow, sentence in zip(sets_of_words, sentences):
+        # sentences covering every word of this one, minus those with the same set of words
+        covering = all_mask
+        for word in sow:
+            covering &= prefix_masks[word]
+        if not covering & ~same_masks[sow]:
+            unique.append(sentence)
+    return unique
+
+
+def lookup_annotation(annotations: dict, emoji: str):
+    try:
+        return annotations[emoji]
+    except KeyError:
+        return annotations.get(emoji.replace('\uFE0F', ''))
+
+
+def build_emoji_table(emojis: list, variants: dict, annotations_per_locale: list,
+                      cancel: threading.Event = None) -> list:
+    """Returns a list of (emoji, title, aliases, variants) tuples
+
+    The title is taken from the first locale having an annotation for the emoji,
+    the aliases of all locales are merged in locale order.
+    """
+
+    table = []
+    for emoji in emojis:
+        check_cancelled(cancel)
+        title = None
+        aliases = []
+        for annotations in annotations_per_locale:
+            if (ann := lookup_annotation(annotations, emoji)) is None:
+                continue
+
+            tts = ann['tts'][0]
+            if title is None:
+                title = tts
+
+            for alias in remove_redundancy([tts.replace(':', '').replace(',', ''), *ann['default']]):
+                if alias not in aliases:
+                    aliases.append(alias)
+
+        if title is None:
+            debug(f"Found no translation for {emoji}. Emoji will not be available.")
+            continue
+
+        table.append((emoji, title, aliases, variants.get(emoji, [])))
+
+    return table
+
+
+def load_snapshot(path: Path, key: dict):
+    """Returns the emoji table stored in the snapshot or None if it is missing or stale"""
+    try:
+        with path.open("r", encoding='utf-8') as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        warning(f"Failed reading emoji index snapshot: {e}")
+        return None
+
+    if snapshot.get('key') != key:
+        debug("Emoji index snapshot is stale.")
+        return None
+
+    return snapshot['emojis']
+
+
+def store_snapshot(path: Path, key: dict, table: list):
+    try:
+        snapshot = json.dumps({'key': key, 'emojis': table}, ensure_ascii=False, separators=(',', ':'))
+        write_file_atomically(path, snapshot.encode('utf-8'))
+    except OSError as e:
+        warning(f"Failed writing emoji index snapshot: {e}")
+
+
+class SourceRefresherThread(threading.Thread):
+    """Periodically checks the cached upstream files for updates and calls back on changes"""
+
+    def __init__(self, callback, get_sources, daemon=None):
+        super().__init__(daemon=daemon)
+        self._stop_event = threading.Event()
+        self.callback = callback
+        self.get_sources = get_sources
+
+    def refresh(self) -> bool:
+        changed = False
+        for url, path in self.get_sources():
+            if self._stop_event.is_set():
+                break
+            if not path.is_file():
+                continue  # initial downloads are done by the index build
+            try:
+                changed |= download_file(url, path, timeout=30)
+            except Exception as e:
+                warning(f"Failed refreshing {url}: {e}")
+        return changed
+
+    def run(self):
+        timeout = REFRESH_DELAY
+        while not self._stop_event.wait(timeout):  # wakeup on stop event
+            if self.refresh() and not self._stop_event.is_set():
+                info("Emoji data changed upstream. Rebuilding index.")
+                self.callback()
+            timeout = REFRESH_INTERVAL
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class EmojiTable:
+    """Column store of the (emoji, title, aliases, variants) rows backing the items"""
+
+    __slots__ = ('emojis', 'titles', 'aliases', 'variants', 'skin_tone')
+
+    def __init__(self, table: list, skin_tone: str = ''):
+        self.emojis = [sys.intern(emoji) for emoji, _, _, _ in table]
+        self.titles = [title for _, title, _, _ in table]
+        self.aliases = [tuple(aliases) for _, _, aliases, _ in table]
+        # Sparse, most emojis do not have variants
+        self.variants = {row: tuple(map(tuple, variants)) for row, (_, _, _, variants) in enumerate(table) if variants}
+        self.skin_tone = skin_tone
+
+    def emoji(self, row: int) -> str:
+        """Returns the emoji of the row in the preferred skin tone, if available"""
+        if self.skin_tone:
+            for variant, modifier in self.variants.get(row, ()):
+                if modifier == self.skin_tone:
+                    return variant
+        return self.emojis[row]
+
+
+def deletes(word: str, max_distance: int) -> set:
+    """Returns all strings derived from word by deleting up to max_distance characters"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def edit_distances(a: str, b: str) -> list:
+    """Optimal string alignment distances, i.e. Levenshtein plus adjacent
+    transpositions, between a and each prefix of b"""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        curr = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            curr[j] = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                curr[j] = min(curr[j], prev2[j - 2] + 1)
+        prev2, prev = prev, curr
+    return prev
+
+
+def prefix_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Edit distance between a and the closest prefix of b, e.g. of a word still being typed"""
+    distances = edit_distances(a, b[:len(a) + max_distance])
+    return min(distances[max(0, len(a) - max_distance):])
+
+
+class FuzzyIndex:
+    """Symmetric delete (SymSpell) index over the alias tokens of an EmojiTable
+
+    Maps the deletes of every token prefix to the tokens they were derived
+    from. Candidates for a misspelled query token are looked up via its own
+    deletes and verified with the edit distance to their closest prefix, as
+    the query may end in a word still being typed.
+    """
+
+    __slots__ = ('items', 'tokens', 'rows', 'deletes')
+
+    # Only the token prefixes up to this length are indexed. Bounds the number of deletes per token.
+    PREFIX_LENGTH = 7
+    MAX_DISTANCE = 2
+
+    def __init__(self, aliases_per_row: list, items: list, cancel: threading.Event = None):
+        self.items = items
+        token_rows = {}
+        for row, aliases in enumerate(aliases_per_row):
+            for alias in aliases:
+                for token in alias.lower().split():
+                    token_rows.setdefault(token, set()).add(row)
+
+        self.tokens = sorted(token_rows)
+        self.rows = [tuple(token_rows[token]) for token in self.tokens]
+        self.deletes = {}
+        for i, token in enumerate(self.tokens):
+            check_cancelled(cancel)
+            # deletes of all prefixes, as a query token may be part of a word still being typed
+            prefix_deletes = set()
+            for length in range(2, min(len(token), self.PREFIX_LENGTH) + 1):
+                prefix_deletes |= deletes(token[:length], self.MAX_DISTANCE)
+            for delete in prefix_deletes:
+                self.deletes.setdefault(delete, []).append(i)
+
+    @classmethod
+    def max_distance(cls, token: str) -> int:
+        # short tokens would match almost anything
+        return 0 if len(token) < 3 else 1 if len(token) < 5 else cls.MAX_DISTANCE
+
+    def prefix_rows(self, token: str):
+        """Returns the rows having a token starting with token, None if there are none"""
+        i = bisect_left(self.tokens, token)
+        if i == len(self.tokens) or not self.tokens[i].startswith(token):
+            return None
+        rows = set()
+        while i < len(self.tokens) and self.tokens[i].startswith(token):
+            rows.update(self.rows[i])
+            i += 1
+        return rows
+
+    def similar_rows(self, token: str) -> dict:
+        """Returns the rows having a token similar to token, mapped to the edit distance"""
+        max_distance = self.max_distance(token)
+        if max_distance == 0:
+            return {}
+
+        candidates = set()
+        for delete in deletes(token[:self.PREFIX_LENGTH], max_distance):
+            candidates.update(self.deletes.get(delete, ()))
+
+        rows = {}
+        for i in candidates:
+            candidate = self.tokens[i]
+            if len(candidate) < len(token) - max_distance:
+                continue
+            if (distance := prefix_edit_distance(token, candidate, max_distance)) <= max_distance:
+                for row in self.rows[i]:
+                    rows[row] = min(distance, rows.get(row, distance))
+        return rows
+
+    def lookup(self, query: str) -> list:
+        """Returns the items matching query if at least one of its tokens is misspelled
+
+        Queries without misspelled tokens are left to the regular index, which
+        already matches them. Items are sorted by total edit distance.
+        """
+        matches = None
+        misspelled = False
+        for token in query.lower().split():
+            if (rows := self.prefix_rows(token)) is not None:
+                rows = dict.fromkeys(rows, 0)
+            else:
+                misspelled = True
+                rows = self.similar_rows(token)
+
+            if matches is None:
+                matches = rows
+            else:
+                matches = {row: matches[row] + distance for row, distance in rows.items() if row in matches}
+
+            if not matches:
+                return []
+
+        if not misspelled:
+            return []
+
+        return [self.items[row] for row in sorted(matches, key=matches.get)]
+
+
+class EmojiItem(Item):
+    """Item referencing a row of an EmojiTable. Text, subtext and actions are built when the item is shown."""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: EmojiTable, row: int):
+        Item.__init__(self)
+        self._table = table
+        self._row = row
+
+    def id(self):
+        return self._table.emojis[self._row]
+
+    def text(self):
+        return self._table.titles[self._row].capitalize()
+
+    def subtext(self):
+        return ", ".join([a.capitalize() for a in self._table.aliases[self._row]])
+
+    def inputActionText(self):
+        return ""
+
+    def iconUrls(self):
+        return [f"gen:?text={self._table.emoji(self._row)}"]
+
+    def actions(self):
+        emoji = self._table.emoji(self._row)
+        actions = []
+        if havePasteSupport():
+            actions.append(
+                Action(
+                    "paste", "Copy and paste to front-most window",
+                    lambda emj=emoji: setClipboardTextAndPaste(emj)
+                )
+            )
+
+        actions.append(
+            Action(
+                "copy", "Copy to clipboard",
+                lambda emj=emoji: setClipboardText(emj)
+            )
+        )
+
+        # Expand the variants
+        copy = setClipboardTextAndPaste if havePasteSupport() else setClipboardText
+        base = self._table.emojis[self._row]
+        for variant, modifier in ((base, 'default'), *self._table.variants.get(self._row, ())):
+            if variant != emoji:
+                actions.append(
+                    Action(
+                        variant, f"{variant} {modifier.capitalize()}",
+                        lambda emj=variant: copy(emj)
+                    )
+                )
+
+        return actions
+
 
 class Plugin(PluginInstance, IndexQueryHandler):
 
     def __init__(self):
         PluginInstance.__init__(self)
         IndexQueryHandler.__init__(self)
-        self.thread = None
+        self.build_cancel = None
+        self.build_lock = threading.Lock()
+        self.fuzzy_index = None
 
         self._use_derived = self.readConfig('use_derived', bool)
         if self._use_derived is None:
             self._use_derived = False
 
+        self._locales = self.readConfig('locales', str)
+        if self._locales is None:
+            self._locales = ''
+
+        self._skin_tone = self.readConfig('skin_tone', str)
+        if self._skin_tone is None:
+            self._skin_tone = 'default'
+
+        self._fuzzy = self.readConfig('fuzzy', bool)
+        if self._fuzzy is None:
+            self._fuzzy = False
+
+        self.emoji_table = None
+        # Keeps the Python side of the items alive, the index only holds them in C++
+        self.emoji_items = []
+
+        self.refresher = SourceRefresherThread(self.updateIndexItems, self.sources, daemon=True)
+        self.refresher.start()
+
     def __del__(self):
-        if self.thread and self.thread.is_alive():
-            self.thread.join()
+        # Do not wait for network or parsing, the threads bail out at their next checkpoint
+        self.refresher.stop()
+        if self.build_cancel:
+            self.build_cancel.set()
 
     def defaultTrigger(self):
         return ':'
@@ -48,175 +629,157 @@ class Plugin(PluginInstance, IndexQueryHandler):
         self.writeConfig('use_derived', value)
         self.updateIndexItems()
 
+    @property
+    def locales(self):
+        return self._locales
+
+    @locales.setter
+    def locales(self, value):
+        self._locales = value
+        self.writeConfig('locales', value)
+        self.updateIndexItems()
+
+    @property
+    def skin_tone(self):
+        return self._skin_tone
+
+    @skin_tone.setter
+    def skin_tone(self, value):
+        self._skin_tone = value
+        self.writeConfig('skin_tone', value)
+        # Variants are resolved when items are shown, no rebuild needed
+        if self.emoji_table:
+            self.emoji_table.skin_tone = value if value in SKIN_TONES else ''
+
+    @property
+    def fuzzy(self):
+        return self._fuzzy
+
+    @fuzzy.setter
+    def fuzzy(self, value):
+        self._fuzzy = value
+        self.writeConfig('fuzzy', value)
+        self.updateIndexItems()
+
     def configWidget(self):
         return [
             {
                 'type': 'checkbox',
                 'property': 'use_derived',
                 'label': 'Use derived emojis'
+            },
+            {
+                'type': 'checkbox',
+                'property': 'fuzzy',
+                'label': 'Typo tolerant search',
+                'widget_properties': {
+                    'tooltip': 'Additionally finds emojis if words of the query are misspelled. '
+                               'Costs a few megabytes of memory.'
+                }
+            },
+            {
+                'type': 'lineedit',
+                'property': 'locales',
+                'label': 'Locales',
+                'widget_properties': {
+                    'tooltip': 'Comma separated list of CLDR locales to take aliases from, e.g. "en, de, ja". '
+                               'Defaults to the system locale.'
+                }
+            },
+            {
+                'type': 'combobox',
+                'property': 'skin_tone',
+                'label': 'Preferred skin tone',
+                'items': ['default', *SKIN_TONES]
             }
         ]
 
-    def updateIndexItems(self):
-        if self.thread and self.thread.is_alive():
-            self.thread.join()
-        self.thread = threading.Thread(target=self.update_index_items_task)
-        self.thread.start()
-
-    def update_index_items_task(self):
-
-        def download_file(url: str, path: Path):
-            debug(f"Downloading {url}.")
-            headers = {'User-Agent': 'Mozilla/5.0'}  # otherwise github returns html
-            request = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(request, timeout=3) as response:
-                if response.getcode() == 200:
-                    debug(f"Success. Storing to {path}.")
-                    with builtins.open(path, 'wb') as file:
-                        file.write(response.read())
-                else:
-                    raise RuntimeError(f"Failed to download {url}. Status code: {response.getcode()}")
-
-        def get_fully_qualified_emojis(cache_path: Path) -> list:
-            """Returns fully qualified emoji strings"""
-
-            def convert_to_unicode_char(hex_code: str):
-                return chr(int(hex_code, 16))
-
-            def convert_to_unicode_str(hex_codes: str):
-                hex_list = hex_codes.split()
-                return ''.join([convert_to_unicode_char(hex_code) for hex_code in hex_list])
-
-            path = cache_path / 'emoji_list.txt'
-            if not path.is_file():
-                info("Fetching emoji list.")
-                url = 'https://unicode.org/Public/emoji/latest/emoji-test.txt'
-                download_file(url, path)
-
-            # components = set()
-            fully_qualified = []
-
-            with path.open("r") as f:
-
-                emoji_list_re_str = r"""
-                         ^
-                         (?P<codepoints> .*\S)
-                         \s*;\s*
-                         (?P<status> \S+)
-                         \s*\#\s*
-                         (?P<emoji> \S+)
-                         \s*
-                         (?P<version> E\d+.\d+)
-                         \s*
-                         (?P<name> [^:]+)
-                         (?: : \s* (?P<modifier> .+))?
-                         \n
-                         $
-                         """
-
-                line_re = re.compile(emoji_list_re_str, re.VERBOSE)
-                for line in f:
-                    if match := line_re.match(line):
-                        if match.group("status") == "fully-qualified":
-                            fully_qualified.append(convert_to_unicode_str(match.group("codepoints")))
-
-            return fully_qualified
-
-        def get_annotations(cache_path: Path, use_derived: bool) -> dict:
-
-            # determine locale
-
-            if lang := getdefaultlocale()[0]:
-                lang = lang[0:2]
-            else:
-                warning("Failed getting locale. There will be no localized emoji aliases.")
-                lang = 'en'
-
-            # fetch localized cldr annotations 'full'
-
-            path_full = cache_path / f'emoji_annotations_full_{lang}.json'
-            if not path_full.is_file():
-                url = 'https://raw.githubusercontent.com/unicode-org/cldr-json/main/cldr-json/' \
-                      'cldr-annotations-full/annotations/%s/annotations.json' % lang
-                download_file(url, path_full)
-
-            with path_full.open("r", encoding='utf-8') as file_full:
-                json_full = json.load(file_full)['annotations']['annotations']
-
-            if not use_derived:
-                return json_full
-
-            # fetch localized cldr annotations 'derived'
+    def sources(self) -> list:
+        """Returns the (url, path) of all upstream files used by the current configuration"""
+        cache_location = self.cacheLocation()
+        sources = [emoji_list_source(cache_location)]
+        for lang in parse_locales(self.locales) or [get_locale()]:
+            sources.append(annotations_source(cache_location, lang, derived=False))
+            if self.use_derived:
+                sources.append(annotations_source(cache_location, lang, derived=True))
+        return sources
 
-            path_derived = cache_path / f'emoji_annotations_derived_{lang}.json'
-            if not path_derived.is_file():
-                url = 'https://raw.githubusercontent.com/unicode-org/cldr-json/main/cldr-json/' \
-                      'cldr-annotations-derived-full/annotationsDerived/%s/annotations.json' % lang
-                download_file(url, path_derived)
+    def updateIndexItems(self):
+        # Supersede the in-flight build instead of waiting for it
+        if self.build_cancel:
+            self.build_cancel.set()
+        self.build_cancel = threading.Event()
+        threading.Thread(target=self.update_index_items_task, args=(self.build_cancel,), daemon=True).start()
 
-            # open, read, parse, merge, return
+    def update_index_items_task(self, cancel: threading.Event):
+        try:
+            self.build_index_items(cancel)
+        except BuildCancelled:
+            debug("Emoji index build superseded.")
 
-            with path_derived.open("r", encoding='utf-8') as file_derived:
-                json_derived = json.load(file_derived)['annotationsDerived']['annotations']
-                return json_full | json_derived
+    def build_index_items(self, cancel: threading.Event):
 
         cache_location = self.cacheLocation()
         cache_location.mkdir(parents=True, exist_ok=True)
-        emojis = get_fully_qualified_emojis(cache_location)
-        annotations = get_annotations(cache_location, self.use_derived)
-
-        def remove_redundancy(sentences):
-            sets_of_words = [set(sentence.lower().split()) for sentence in sentences]
-            unique = []
-            for sow, sentence in zip(sets_of_words, sentences):
-                for other_sow in sets_of_words:
-                    if sow != other_sow:
-                        if all([any([oword.startswith(word) for oword in other_sow]) for word in sow]):
-                            break
-                else:
-                    unique.append(sentence)
-            return unique
-
-        index_items = []
-        for emoji in emojis:
-            try:
-                ann = annotations[emoji]
-            except KeyError:
+        locales = parse_locales(self.locales) or [get_locale()]
+        use_derived = self.use_derived
+
+        def fetch_locale(lang):
+            paths = [fetch_annotations(cache_location, lang, derived=False)]
+            if use_derived:
+                paths.append(fetch_annotations(cache_location, lang, derived=True))
+            return paths
+
+        with ThreadPoolExecutor(max_workers=min(len(locales), MAX_LOCALE_WORKERS)) as pool:
+
+            # Make sure the sources are available, their stats are part of the snapshot key
+            futures = [(lang, pool.submit(fetch_locale, lang)) for lang in locales]
+            emoji_list_path = fetch_emoji_list(cache_location)
+            annotation_paths = []
+            for lang, future in futures:
+                check_cancelled(cancel)
                 try:
-                    non_rgi_emoji = emoji.replace('\uFE0F', '')
-                    ann = annotations[non_rgi_emoji]
-                except KeyError as e:
-                    debug(f"Found no translation for {e}. Emoji will not be available.")
-                    continue
-
-            title = ann['tts'][0]
-            aliases = remove_redundancy([title.replace(':', '').replace(',', ''), *ann['default']])
-
-            actions = []
-            if havePasteSupport():
-                actions.append(
-                    Action(
-                        "paste", "Copy and paste to front-most window",
-                        lambda emj=emoji: setClipboardTextAndPaste(emj)
-                    )
-                )
-
-            actions.append(
-                Action(
-                    "copy", "Copy to clipboard",
-                    lambda emj=emoji: setClipboardText(emj)
-                )
-            )
+                    annotation_paths.append(future.result())
+                except Exception as e:
+                    warning(f"Failed fetching emoji annotations for locale '{lang}': {e}")
+
+            sources = [emoji_list_path, *[p for paths in annotation_paths for p in paths]]
+            snapshot_path = cache_location / 'emoji_index.json'
+            snapshot_key = {
+                'version': SNAPSHOT_VERSION,
+                'locales': locales,
+                'use_derived': use_derived,
+                'sources': [[p.name, (st := p.stat()).st_mtime_ns, st.st_size] for p in sources]
+            }
 
-            item = StandardItem(
-                id=emoji,
-                text=title.capitalize(),
-                subtext=", ".join([a.capitalize() for a in aliases]),
-                iconUrls=[f"gen:?text={emoji}"],
-                actions=actions
-            )
+            check_cancelled(cancel)
+            if (table := load_snapshot(snapshot_path, snapshot_key)) is None:
+                annotations = pool.map(lambda paths: get_annotations(*paths), annotation_paths)
+                emojis, variants = get_fully_qualified_emojis(emoji_list_path, cancel)
+                table = build_emoji_table(emojis, variants, list(annotations), cancel)
+                store_snapshot(snapshot_path, snapshot_key, table)
 
+        skin_tone = self.skin_tone if self.skin_tone in SKIN_TONES else ''
+        emoji_table = EmojiTable(table, skin_tone)
+        emoji_items = []
+        index_items = []
+        for row, aliases in enumerate(emoji_table.aliases):
+            check_cancelled(cancel)
+            emoji_items.append(item := EmojiItem(emoji_table, row))
             for alias in aliases:
                 index_items.append(IndexItem(item=item, string=alias))
 
-        self.setIndexItems(index_items)
+        fuzzy_index = FuzzyIndex(emoji_table.aliases, emoji_items, cancel) if self.fuzzy else None
+
+        # Makes sure a superseded build never overwrites the items of its successor
+        with self.build_lock:
+            check_cancelled(cancel)
+            self.emoji_table = emoji_table
+            self.emoji_items = emoji_items
+            self.fuzzy_index = fuzzy_index
+            self.setIndexItems(index_items)
+
+    def handleTriggerQuery(self, query):
+        super().handleTriggerQuery(query)
+        if (fuzzy_index := self.fuzzy_index) and (string := query.string.strip()):
+            query.add(fuzzy_index.lookup(string))
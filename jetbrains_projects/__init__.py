@@ -26,14 +26,14 @@ Open the IDE and click Tools -> Create Command-line Launcher to add one.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Union, List
+from typing import Optional, Union, List
 from shutil import which
 from sys import platform
 from xml.etree import ElementTree
 from albert import *
 
 md_iid = "3.0"
-md_version = "4.1"
+md_version = "4.2"
 md_name = "Jetbrains projects"
 md_description = "Open your JetBrains projects"
 md_license = "MIT"
@@ -58,6 +58,9 @@ class Editor:
     # Rider calls recentProjects.xml -> recentSolutions.xml and in it RecentProjectsManager -> RiderRecentProjectsManager
     is_rider: bool
 
+    # (path, mtime, size) of the last parsed recent projects file and its projects
+    _cache: Optional[tuple[tuple[Path, int, int], List[Project]]]
+
     def __init__(
             self,
             name: str,
@@ -70,6 +73,7 @@ class Editor:
         self.config_dir_prefix = config_dir_prefix
         self.binary = self._find_binary(binaries)
         self.is_rider = is_rider
+        self._cache = None
 
     @staticmethod
     def _find_binary(binaries: list[str]) -> Union[str, None]:
@@ -91,7 +95,18 @@ class Editor:
             recent_projects_xml = "recentProjects.xml"
         else:
             recent_projects_xml = "recentSolutions.xml"
-        return self._parse_recent_projects(Path(latest) / "options" / recent_projects_xml)
+        recent_projects_file = Path(latest) / "options" / recent_projects_xml
+
+        # Reparse only if the file changed since the last call
+        try:
+            stat = recent_projects_file.stat()
+        except OSError:
+            return []
+        key = (recent_projects_file, stat.st_mtime_ns, stat.st_size)
+        cache = self._cache
+        if cache is None or cache[0] != key:
+            cache = self._cache = (key, self._parse_recent_projects(recent_projects_file))
+        return cache[1]
 
     def _parse_recent_projects(self, recent_projects_file: Path) -> list[Project]:
         try:
@@ -242,13 +257,13 @@ class Plugin(PluginInstance, TriggerQueryHandler):
 
         for editor in self.editors:
             for project in editor.list_projects():
-                if Path(project.path).exists():
-                    if self._match_path:
-                        if m.match(project.name, project.path):
-                            editor_project_pairs.append((editor, project))
-                    else:
-                        if m.match(project.name):
-                            editor_project_pairs.append((editor, project))
+                # Match first, checking the existence is the expensive part
+                if self._match_path:
+                    matched = m.match(project.name, project.path)
+                else:
+                    matched = m.match(project.name)
+                if matched and Path(project.path).exists():
+                    editor_project_pairs.append((editor, project))
 
         # sort by last opened
         editor_project_pairs.sort(key=lambda pair: pair[1].last_opened, reverse=True)
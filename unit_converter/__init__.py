@@ -10,31 +10,73 @@ Usage examples:
 - `convert 32 degrees F to C`
 - `convert 3.14159 rad to degrees`
 - `convert 100 USD to EUR`
+- `convert 5 km to mi, ft, m`
+- `convert 5 km to *` (all compatible units)
 """
 
 import json
+import os
 import re
+import shutil
+import threading
+import time
 import traceback
-from datetime import datetime
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 from urllib.error import URLError
 from urllib.request import urlopen
 
 import inflect
+import numpy as np
 import pint
 from albert import *
 
 md_iid = "3.0"
-md_version = "1.8"
+md_version = "1.9"
 md_name = "Unit Converter"
 md_description = "Convert between units"
 md_license = "MIT"
 md_url = "https://github.com/albertlauncher/python/tree/main/unit_converter"
-md_lib_dependencies = ["pint", "inflect"]
+md_lib_dependencies = ["pint", "inflect", "numpy"]
 md_authors = ["@DenverCoder1", "@Pete-Hamlin"]
 
 
+# icon file name -> path, scanned once so that creating items needs no filesystem access
+ICONS_DIR = Path(__file__).parent / "icons"
+ICON_PATHS: dict[str, str] = {icon.name: str(icon) for icon in ICONS_DIR.glob("*.svg")}
+DEFAULT_ICON_PATH = str(ICONS_DIR / "unit_converter.svg")
+
+
+def search_prefix(keys: list[str], values: list[str], prefix: str, limit: int) -> list[str]:
+    """Return the values whose key starts with the prefix
+
+    Args:
+        keys (list[str]): The sorted keys
+        values (list[str]): The values in the order of the keys
+        prefix (str): The prefix to search for
+        limit (int): The maximum number of values to return
+
+    Returns:
+        list[str]: The matching values
+    """
+    matches = []
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and len(matches) < limit and keys[i].startswith(prefix):
+        matches.append(values[i])
+        i += 1
+    return matches
+
+
+@lru_cache(maxsize=None)
+def get_inflect_engine() -> inflect.engine:
+    """Return the inflect engine shared by all conversion results"""
+    return inflect.engine()
+
+
 class ConversionResult:
     """A class to represent the result of a unit conversion"""
 
@@ -63,10 +105,10 @@ class ConversionResult:
         self.to_unit = to_unit
         self.dimensionality = dimensionality
         self.source = source
-        self.display_names: dict[str, str] = Plugin.config["display_names"]
-        self.inflect_engine = inflect.engine()
 
-    def __pluralize_unit(self, unit: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def pluralize_unit(unit: str) -> str:
         """Pluralize the unit
 
         Args:
@@ -78,7 +120,29 @@ class ConversionResult:
         # if all characters are uppercase, don't pluralize
         if unit.isupper():
             return unit
-        return self.inflect_engine.plural(unit)
+        return get_inflect_engine().plural(unit)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def display_name(unit: str, plural: bool) -> str:
+        """Return the display name of the unit
+
+        Args:
+            unit (str): The unit to display
+            plural (bool): Whether to pluralize the unit
+
+        Returns:
+            str: The name of the unit
+        """
+        unit = ConversionResult.pluralize_unit(unit) if plural else unit
+        return Plugin.config["display_names"].get(unit, unit)
+
+    @staticmethod
+    def precompute_display_names() -> None:
+        """Fill the display name cache for the units of the display names table"""
+        for unit in Plugin.config["display_names"]:
+            ConversionResult.display_name(unit, plural=False)
+            ConversionResult.display_name(unit, plural=True)
 
     def __display_unit_name(self, amount: float, unit: str) -> str:
         """Display the name of the unit with plural if necessary
@@ -90,8 +154,7 @@ class ConversionResult:
         Returns:
             str: The name of the unit
         """
-        unit = self.__pluralize_unit(unit) if amount != 1 else unit
-        return self.display_names.get(unit, unit)
+        return self.display_name(unit, plural=amount != 1)
 
     @staticmethod
     def __format_float(num: float) -> str:
@@ -122,12 +185,24 @@ class ConversionResult:
             result += f" ({self.source})"
         return result
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def icon_name(dimensionality: str) -> str:
+        """Return the icon file name for a dimensionality
+
+        Args:
+            dimensionality (str): The dimensionality, e.g. "[length] / [time]"
+
+        Returns:
+            str: The icon file name
+        """
+        # strip characters from the dimensionality if not alphanumeric or underscore
+        return re.sub(r"\W", "", dimensionality) + ".svg"
+
     @property
     def icon(self) -> str:
         """Return the icon for the result's dimensionality"""
-        # strip characters from the dimensionality if not alphanumeric or underscore
-        dimensionality = re.sub(r"\W", "", self.dimensionality)
-        return f"{dimensionality}.svg"
+        return self.icon_name(self.dimensionality)
 
     def __repr__(self):
         """Return the representation of the result"""
@@ -154,14 +229,160 @@ class UnitConverter:
         """
         raise NotImplementedError
 
+    def compatible_units(self, from_unit: str) -> list[str]:
+        """Get the units the unit can be converted to
+
+        Args:
+            from_unit (str): The unit to convert from
+
+        Returns:
+            list[str]: The compatible units
+        """
+        raise NotImplementedError
+
+    def complete_unit(self, partial: str, limit: int) -> list[str]:
+        """Get the units starting with a partially typed unit
+
+        Args:
+            partial (str): The partially typed unit
+            limit (int): The maximum number of completions
+
+        Returns:
+            list[str]: The completions
+        """
+        raise NotImplementedError
+
+    def convert_many(self, amount: float, from_unit: str, to_units: list[str]) -> list[ConversionResult]:
+        """Convert a unit to several other units
+
+        Args:
+            amount (float): The amount to convert
+            from_unit (str): The unit to convert from
+            to_units (list[str]): The units to convert to, ["*"] for all compatible units
+
+        Returns:
+            list[ConversionResult]: One conversion result per target unit
+        """
+        if to_units == ["*"]:
+            to_units = self.compatible_units(from_unit)
+        return [self.convert(amount, from_unit, to_unit) for to_unit in to_units]
+
 
 class StandardUnitConverter(UnitConverter):
     """Class to convert standard units of measurement"""
 
-    def __init__(self):
-        """Initialize the StandardUnitConverter"""
-        self.units = pint.UnitRegistry()
+    # words of a unit expression like "km/hour", "meter ** 2" or "cmH2O", digits included
+    UNIT_TOKEN_REGEX = re.compile(r"[^\W\d]\w*")
+    # exponent written right after a unit, like "km²" or "m3"
+    UNIT_EXPONENT_REGEX = re.compile(r"[\d⁰¹²³⁴-⁹]+$")
+    # maximum number of candidates ranked per completion
+    COMPLETION_SCAN_LIMIT = 200
+
+    def __init__(self, cache_folder: Optional[Path] = None):
+        """Initialize the StandardUnitConverter
+
+        Args:
+            cache_folder (Optional[Path]): The directory to cache the preparsed registry definitions in
+        """
+        start = time.perf_counter()
+        self.units = pint.UnitRegistry(cache_folder=cache_folder)
+        cache_state = "without cache" if cache_folder is None else f"with cache {cache_folder}"
+        info(f"Unit registry built in {(time.perf_counter() - start) * 1000:.0f} ms {cache_state}")
+        self._get_unit = lru_cache(maxsize=512)(self._get_unit)
+        self._resolve_conversion = lru_cache(maxsize=256)(self.__resolve_conversion)
+        self._root_factor = lru_cache(maxsize=1024)(self.__root_factor)
+        self._compatible_units: dict[str, tuple[list[pint.Unit], list[str], np.ndarray]] = {}
+        self._unit_names_by_dimensionality: Optional[dict[str, list[str]]] = None
+        self._unit_names_lock = threading.Lock()
         super().__init__()
+        # names, symbols and aliases of the registry and the alias table, for fast rejection of non-units
+        self.unit_tokens = frozenset(self.units._units).union(
+            *(self.UNIT_TOKEN_REGEX.findall(alias) for alias in (*self.aliases, *self.aliases.values()))
+        )
+        self.unit_prefixes = tuple(prefix for prefix in self.units._prefixes if prefix)
+        # sorted case-insensitive index of the unit names and aliases for completion
+        completion_names = sorted({*self.units._units, *self.aliases}, key=str.lower)
+        self.completion_keys = [name.lower() for name in completion_names]
+        self.completion_names = completion_names
+        # the canonical names only, combined with the prefix names, e.g. "kilo" + "meter"
+        unit_names = sorted({definition.name for definition in self.units._units.values()}, key=str.lower)
+        self.unit_name_keys = [name.lower() for name in unit_names]
+        self.unit_names = unit_names
+        # longest first, e.g. "mega" wins over "m"
+        self.prefix_names = sorted(
+            {definition.name for definition in self.units._prefixes.values() if definition.name}, key=len, reverse=True
+        )
+
+    def complete_unit(self, partial: str, limit: int) -> list[str]:
+        """Get the units starting with a partially typed unit, e.g. "kilom" -> "kilometer"
+
+        Args:
+            partial (str): The partially typed unit
+            limit (int): The maximum number of completions
+
+        Returns:
+            list[str]: The completions, shortest first
+        """
+        partial = partial.lower()
+        # rank a bounded number of candidates, shortest first, rather than the first ones alphabetically
+        scan_limit = self.COMPLETION_SCAN_LIMIT
+        completions = search_prefix(self.completion_keys, self.completion_names, partial, scan_limit)
+        for prefix in self.prefix_names:
+            if partial.startswith(prefix) and len(partial) > len(prefix):
+                remainder = partial[len(prefix):]
+                for name in search_prefix(self.unit_name_keys, self.unit_names, remainder, scan_limit):
+                    completions.append(prefix + name)
+                break
+        # prefixed units already defined in the registry are found by both searches
+        completions = list(dict.fromkeys(completions))
+        return sorted(completions, key=lambda name: (len(name), name.lower()))[:limit]
+
+    def _is_unit_token(self, token: str) -> bool:
+        """Check if the token is a known unit name, optionally prefixed, pluralized and raised to a power
+
+        Args:
+            token (str): The token to check
+
+        Returns:
+            bool: Whether the token could be a unit
+        """
+        # names like "cmH2O" or "A_90" contain digits themselves
+        if self._is_unit_name(token):
+            return True
+        base = self.UNIT_EXPONENT_REGEX.sub("", token)
+        return base != token and self._is_unit_name(base)
+
+    def _is_unit_name(self, token: str) -> bool:
+        """Check if the token is a known unit name, optionally prefixed and pluralized
+
+        Args:
+            token (str): The token to check
+
+        Returns:
+            bool: Whether the token could be a unit name
+        """
+        for name in {token, token.lower()}:
+            for stem in (name, name[:-1] if name.endswith("s") else ""):
+                if not stem:
+                    continue
+                if stem in self.unit_tokens:
+                    return True
+                for prefix in self.unit_prefixes:
+                    if stem.startswith(prefix) and stem[len(prefix):] in self.unit_tokens:
+                        return True
+        return False
+
+    def is_unit_expression(self, unit: str) -> bool:
+        """Check if all words of the unit expression are known units without asking pint
+
+        Args:
+            unit (str): The unit expression to check
+
+        Returns:
+            bool: Whether the expression could be a unit
+        """
+        tokens = self.UNIT_TOKEN_REGEX.findall(self.aliases.get(unit, unit))
+        return bool(tokens) and all(self._is_unit_token(token) for token in tokens)
 
     def _get_unit(self, unit: str) -> pint.Unit:
         """Check if the unit is a valid unit and return it
@@ -185,6 +406,162 @@ class StandardUnitConverter(UnitConverter):
         # check if the lowercase version is a valid unit
         return self.units.__getattr__(unit.lower())
 
+    def __resolve_conversion(self, from_unit: str, to_unit: str) -> tuple:
+        """Resolve the units of a conversion and the factor if the conversion is multiplicative
+
+        Args:
+            from_unit (str): The unit to convert from
+            to_unit (str): The unit to convert to
+
+        Returns:
+            tuple: The input unit, the output unit, the dimensionality string and
+                the conversion factor or None for offset units like degC
+
+        Raises:
+            pint.errors.UndefinedUnitError: If the unit is not valid
+            pint.errors.DimensionalityError: If the units are not compatible
+        """
+        input_unit = self._get_unit(from_unit)
+        output_unit = self._get_unit(to_unit)
+        unit_factor = self.units.Quantity(1, input_unit).to(output_unit).magnitude
+        # offset units (degC, degF, ...) do not map zero to zero
+        is_multiplicative = self.units.Quantity(0, input_unit).to(output_unit).magnitude == 0
+        return (
+            input_unit,
+            output_unit,
+            str(output_unit.dimensionality),
+            unit_factor if is_multiplicative else None,
+        )
+
+    def __root_factor(self, unit: pint.Unit) -> float:
+        """Get the factor converting the unit to its root units
+
+        Args:
+            unit (pint.Unit): The unit
+
+        Returns:
+            float: The factor or NaN for offset units like degC
+        """
+        # offset units do not map zero to zero
+        if self.units.Quantity(0, unit).to_root_units().magnitude != 0:
+            return np.nan
+        return self.units.get_root_units(unit)[0]
+
+    def __get_unit_names_by_dimensionality(self) -> dict[str, list[str]]:
+        """Group the canonical names of all units of the registry by dimensionality, once
+
+        Unlike pint's get_compatible_units, this includes the units not defined
+        directly in base units, e.g. mile, foot and yard for [length].
+
+        Returns:
+            dict[str, list[str]]: The unit names sorted by name per dimensionality
+        """
+        with self._unit_names_lock:
+            if self._unit_names_by_dimensionality is None:
+                start = time.perf_counter()
+                groups: dict[str, list[str]] = {}
+                for name in sorted({self.units.get_name(name) for name in self.units}):
+                    try:
+                        dimensionality = str(self.units.get_dimensionality(name))
+                    except pint.errors.PintError:
+                        continue
+                    groups.setdefault(dimensionality, []).append(name)
+                self._unit_names_by_dimensionality = groups
+                debug(f"Grouped units by dimensionality in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return self._unit_names_by_dimensionality
+
+    def __get_compatible_units(self, unit: pint.Unit) -> tuple[list[pint.Unit], list[str], np.ndarray]:
+        """Get the units compatible with the unit, computed once per dimensionality
+
+        Args:
+            unit (pint.Unit): The unit
+
+        Returns:
+            tuple[list[pint.Unit], list[str], np.ndarray]: The compatible units sorted by name,
+                their names and their root factors
+        """
+        dimensionality = str(unit.dimensionality)
+        if (compatible := self._compatible_units.get(dimensionality)) is None:
+            names = self.__get_unit_names_by_dimensionality().get(dimensionality, [])
+            units = [self.units.Unit(name) for name in names]
+            compatible = units, [str(u) for u in units], np.array([self._root_factor(u) for u in units])
+            self._compatible_units[dimensionality] = compatible
+        return compatible
+
+    def compatible_units(self, from_unit: str) -> list[str]:
+        """Get the units the unit can be converted to
+
+        Args:
+            from_unit (str): The unit to convert from
+
+        Returns:
+            list[str]: The compatible units
+        """
+        return self.__get_compatible_units(self._get_unit(from_unit))[1]
+
+    def convert_many(self, amount: float, from_unit: str, to_units: list[str]) -> list[ConversionResult]:
+        """Convert a unit to several other units
+
+        The amounts of all multiplicative target units are computed in a
+        single vectorized pass from the factors to the root units.
+
+        Args:
+            amount (float): The amount to convert
+            from_unit (str): The unit to convert from
+            to_units (list[str]): The units to convert to, ["*"] for all compatible units
+
+        Returns:
+            list[ConversionResult]: One conversion result per target unit
+
+        Raises:
+            pint.errors.UndefinedUnitError: If a unit is not valid
+            pint.errors.DimensionalityError: If the units are not compatible
+        """
+        if len(to_units) == 1 and to_units != ["*"]:
+            return [self.convert(amount, from_unit, to_units[0])]
+
+        input_unit = self._get_unit(from_unit)
+        input_name = str(input_unit)
+        dimensionality = input_unit.dimensionality
+        dimensionality_name = str(dimensionality)
+        if to_units == ["*"]:
+            output_units, output_names, to_factors = self.__get_compatible_units(input_unit)
+            mask = np.array([name != input_name for name in output_names], dtype=bool)
+            output_units = [u for u, keep in zip(output_units, mask) if keep]
+            output_names = [name for name, keep in zip(output_names, mask) if keep]
+            to_factors = to_factors[mask]
+        else:
+            output_units = [self._get_unit(to_unit) for to_unit in to_units]
+            for output_unit in output_units:
+                if (output_dimensionality := output_unit.dimensionality) != dimensionality:
+                    raise pint.errors.DimensionalityError(input_unit, output_unit, dimensionality, output_dimensionality)
+            output_names = [str(output_unit) for output_unit in output_units]
+            to_factors = np.array([self._root_factor(output_unit) for output_unit in output_units])
+
+        # NaN for offset units, these take the pint path
+        to_amounts = amount * self._root_factor(input_unit) / to_factors
+
+        results = []
+        for output_unit, output_name, to_amount in zip(output_units, output_names, to_amounts.tolist()):
+            if np.isnan(to_amount):
+                try:
+                    to_amount = self.units.Quantity(amount, input_unit).to(output_unit).magnitude
+                except (pint.errors.DimensionalityError, pint.errors.OffsetUnitCalculusError):
+                    # e.g. degree_Celsius and delta_degree_Celsius share the dimensionality
+                    if to_units == ["*"]:
+                        continue
+                    raise
+            results.append(
+                ConversionResult(
+                    from_amount=float(amount),
+                    from_unit=input_name,
+                    to_amount=to_amount,
+                    to_unit=output_name,
+                    dimensionality=dimensionality_name,
+                )
+            )
+        return results
+
     def convert(self, amount: float, from_unit: str, to_unit: str) -> ConversionResult:
         """Convert a unit to another unit
 
@@ -200,15 +577,17 @@ class StandardUnitConverter(UnitConverter):
             pint.errors.UndefinedUnitError: If the unit is not valid
             pint.errors.DimensionalityError: If the units are not compatible
         """
-        input_unit = self.units.Quantity(amount, self._get_unit(from_unit))
-        output_unit = self._get_unit(to_unit)
-        result = input_unit.to(output_unit)
+        input_unit, output_unit, dimensionality, unit_factor = self._resolve_conversion(from_unit, to_unit)
+        if unit_factor is not None:
+            to_amount = amount * unit_factor
+        else:
+            to_amount = self.units.Quantity(amount, input_unit).to(output_unit).magnitude
         return ConversionResult(
             from_amount=float(amount),
-            from_unit=str(self._get_unit(from_unit)),
-            to_amount=result.magnitude,
-            to_unit=str(result.units),
-            dimensionality=str(self.units._get_dimensionality(result.units)),
+            from_unit=str(input_unit),
+            to_amount=to_amount,
+            to_unit=str(output_unit),
+            dimensionality=dimensionality,
         )
 
 
@@ -229,31 +608,98 @@ class CurrencyConverter(UnitConverter):
     """Class to convert currencies"""
 
     API_URL = "https://open.er-api.com/v6/latest/USD"
+    API_TIMEOUT = 5
     ATTRIBUTION = "Rates by https://www.exchangerate-api.com"
+    # rates older than this are refreshed in the background
+    MAX_AGE = timedelta(days=1)
+    # minimum time between two refresh attempts
+    RETRY_INTERVAL = timedelta(hours=1)
 
-    def __init__(self):
-        """Initialize the CurrencyConverter"""
-        self.last_update = datetime.now()
-        self.currencies = self._get_currencies()
+    def __init__(self, cache_path: Optional[Path] = None, api_url: str = API_URL):
+        """Initialize the CurrencyConverter
+
+        Args:
+            cache_path (Optional[Path]): The directory to persist the rates in
+            api_url (str): The URL of the exchange rate API
+        """
+        self.api_url = api_url
+        self.cache_file = cache_path / "currencies.json" if cache_path else None
+        self.last_update = datetime.min
+        self.last_attempt = datetime.min
+        self.currencies: dict[str, float] = {}
+        self.currency_codes: list[str] = []
+        self.refresh_thread: Optional[threading.Thread] = None
+        self._load_cached_currencies()
         super().__init__()
 
-    def _get_currencies(self) -> dict[str, float]:
+    def _set_currencies(self, data: dict[str, Any]) -> None:
+        """Replace the currency table with the rates of an API response
+
+        Args:
+            data (dict[str, Any]): The API response
+        """
+        self.currencies = data["rates"]
+        self.currency_codes = sorted(self.currencies)
+        if "time_last_update_unix" in data:
+            self.last_update = datetime.fromtimestamp(data["time_last_update_unix"])
+        else:
+            self.last_update = datetime.now()
+
+    def _load_cached_currencies(self) -> None:
+        """Load the currencies persisted by a previous refresh"""
+        if self.cache_file is None or not self.cache_file.is_file():
+            return
+        try:
+            with self.cache_file.open() as file:
+                self._set_currencies(json.load(file))
+        except (OSError, ValueError, KeyError) as error:
+            warning(f"Error reading cached currencies: {error}")
+
+    def _get_currencies(self) -> Optional[dict[str, Any]]:
         """Get the currencies from the API
 
         Returns:
-            dict[str, float]: The currencies
+            Optional[dict[str, Any]]: The API response or None if the request failed
         """
         try:
-            with urlopen(self.API_URL) as response:
+            with urlopen(self.api_url, timeout=self.API_TIMEOUT) as response:
                 data = json.loads(response.read().decode("utf-8"))
             if not data or "rates" not in data:
                 info("No currencies found")
-                return {}
+                return None
             info(f"Currencies updated")
-            return data["rates"]
-        except URLError as error:
+            return data
+        except (URLError, TimeoutError, ValueError) as error:
             warning(f"Error getting currencies: {error}")
-            return {}
+            return None
+
+    def refresh(self) -> bool:
+        """Fetch the currencies and persist them. Keeps the current table if the request fails.
+
+        Returns:
+            bool: Whether the currencies were updated
+        """
+        if (data := self._get_currencies()) is None:
+            return False
+        self._set_currencies(data)
+        if self.cache_file is not None:
+            try:
+                tmp_file = self.cache_file.with_suffix(".tmp")
+                tmp_file.write_text(json.dumps(data))
+                os.replace(tmp_file, self.cache_file)
+            except OSError as error:
+                warning(f"Error caching currencies: {error}")
+        return True
+
+    def _refresh_in_background(self) -> None:
+        """Start a refresh unless one is running or the last attempt was too recent"""
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            return
+        if datetime.now() - self.last_attempt < self.RETRY_INTERVAL:
+            return
+        self.last_attempt = datetime.now()
+        self.refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+        self.refresh_thread.start()
 
     def get_currency(self, currency: str) -> Optional[str]:
         """Get the currency name normalized using aliases and capitalization
@@ -264,13 +710,37 @@ class CurrencyConverter(UnitConverter):
         Returns:
             Optional[str]: The currency name or None if not found
         """
-        # update the currencies every 24 hours
-        if not self.currencies or (datetime.now() - self.last_update).days >= 1:
-            self.currencies = self._get_currencies()
-            self.last_update = datetime.now()
+        # serve the current rates, even if stale, and update them in the background
+        if not self.currencies or datetime.now() - self.last_update >= self.MAX_AGE:
+            self._refresh_in_background()
         currency = self.aliases.get(currency, currency).upper()
         return currency if currency in self.currencies else None
 
+    def complete_unit(self, partial: str, limit: int) -> list[str]:
+        """Get the currency codes starting with a partially typed currency
+
+        Args:
+            partial (str): The partially typed currency
+            limit (int): The maximum number of completions
+
+        Returns:
+            list[str]: The completions
+        """
+        currency_codes = self.currency_codes
+        return search_prefix(currency_codes, currency_codes, partial.upper(), limit)
+
+    def compatible_units(self, from_unit: str) -> list[str]:
+        """Get the currencies the currency can be converted to
+
+        Args:
+            from_unit (str): The currency to convert from
+
+        Returns:
+            list[str]: The other currencies
+        """
+        from_currency = self.get_currency(from_unit)
+        return sorted(currency for currency in self.currencies if currency != from_currency)
+
     def convert(self, amount: float, from_unit: str, to_unit: str) -> ConversionResult:
         """Convert a currency to another currency
 
@@ -286,15 +756,16 @@ class CurrencyConverter(UnitConverter):
             UnknownCurrencyError: If the currency is not valid
         """
         # get the currency rates
+        currencies = self.currencies
         from_currency = self.get_currency(from_unit)
         to_currency = self.get_currency(to_unit)
         # convert the currency
-        if from_currency is None:
+        if from_currency is None or from_currency not in currencies:
             raise UnknownCurrencyError(from_unit)
-        if to_currency is None:
+        if to_currency is None or to_currency not in currencies:
             raise UnknownCurrencyError(to_unit)
-        from_rate = self.currencies[from_currency]
-        to_rate = self.currencies[to_currency]
+        from_rate = currencies[from_currency]
+        to_rate = currencies[to_currency]
         result = amount * to_rate / from_rate
         return ConversionResult(
             from_amount=float(amount),
@@ -347,62 +818,132 @@ class Plugin(PluginInstance, GlobalQueryHandler):
         PluginInstance.__init__(self)
         GlobalQueryHandler.__init__(self)
 
+        # a number followed by a partially typed source unit or a partially typed (last) target unit
+        self.from_completion_regex = re.compile(r"(?P<head>-?\d+\.?\d*\s?)(?P<partial>\S+)")
+        self.to_completion_regex = re.compile(
+            r"(?P<head>-?\d+\.?\d*\s?(?P<from_unit>.*?)\s(?:to|in)\s(?:.*,\s*)?)(?P<partial>[^,\s]+)", re.I
+        )
+        # cheap check for a leading number and a separator, rejects most queries at the first character
+        self.conversion_prefilter = re.compile(r"-?\d.*?\s(?:to|in)\s", re.I)
         self.unit_convert_regex = re.compile(
             r"(?P<from_amount>-?\d+\.?\d*)\s?(?P<from_unit>.*)\s(?:to|in)\s(?P<to_unit>.*)",
             re.I,
         )
-        self.unit_converter = StandardUnitConverter()
-        self.currency_converter = CurrencyConverter()
+        # Building the unit registry and fetching the currencies takes a while, do it in the background
+        cache_location = self.cacheLocation()
+        cache_location.mkdir(parents=True, exist_ok=True)
+        # pint keys its cache by the content of the definition files, the version subdirectory
+        # additionally drops caches of other pint versions whose pickled layout may differ
+        registry_cache = cache_location / f"pint-{pint.__version__}"
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.unit_converter_future = executor.submit(self._load_unit_converter, registry_cache)
+        self.currency_converter_future = executor.submit(CurrencyConverter, cache_location)
+        executor.shutdown(wait=False)
+        for future in (self.unit_converter_future, self.currency_converter_future):
+            future.add_done_callback(self._log_load_error)
+
+    @staticmethod
+    def _load_unit_converter(registry_cache: Path) -> StandardUnitConverter:
+        """Create the StandardUnitConverter and warm up the display name cache
+
+        Args:
+            registry_cache (Path): The directory to cache the preparsed registry definitions in
+
+        Returns:
+            StandardUnitConverter: The unit converter
+        """
+        for stale_cache in registry_cache.parent.glob("pint-*"):
+            if stale_cache != registry_cache:
+                shutil.rmtree(stale_cache, ignore_errors=True)
+        unit_converter = StandardUnitConverter(registry_cache)
+        ConversionResult.precompute_display_names()
+        return unit_converter
+
+    @staticmethod
+    def _log_load_error(future: Future) -> None:
+        if error := future.exception():
+            warning(f"Failed loading converter: {error}")
+
+    @property
+    def unit_converter(self) -> Optional[StandardUnitConverter]:
+        """The StandardUnitConverter or None if it is not (yet) available"""
+        future = self.unit_converter_future
+        return future.result() if future.done() and not future.exception() else None
+
+    @property
+    def currency_converter(self) -> Optional[CurrencyConverter]:
+        """The CurrencyConverter or None if it is not (yet) available"""
+        future = self.currency_converter_future
+        return future.result() if future.done() and not future.exception() else None
 
     def defaultTrigger(self):
         return "convert "
 
     def synopsis(self, query):
-        return "<amount> <from_unit> to <to_unit>"
+        return "<amount> <from_unit> to <to_unit>[, <to_unit>…] | *"
 
     def handleTriggerQuery(self, query: Query) -> None:
         if query_string := query.string.strip():
-            items = self.match_query(query_string)
+            if not self.unit_converter_future.done():
+                query.add(self._create_item("Loading units…", "The unit registry is not ready yet"))
+                return
+            items = self.match_query(query_string) or self._get_completions(query.trigger, query_string)
             query.add(items)
 
     def handleGlobalQuery(self, query):
         return [RankItem(item=item, score=1) for item in self.match_query(query.string.strip())]
 
+    def _is_known_unit(self, unit: str) -> bool:
+        """Check if the unit is a known currency or could be a unit of the registry
+
+        Args:
+            unit (str): The unit to check
+
+        Returns:
+            bool: Whether the unit is worth passing to the converters
+        """
+        currency_converter = self.currency_converter
+        if currency_converter is not None and currency_converter.get_currency(unit) is not None:
+            return True
+        return self.unit_converter.is_unit_expression(unit)
+
     def match_query(self, query_string: str):
+        if self.unit_converter is None or not self.conversion_prefilter.match(query_string):
+            return []
         match = self.unit_convert_regex.fullmatch(query_string)
         if match:
+            from_unit = match.group("from_unit").strip()
+            to_units = [to_unit for to_unit in map(str.strip, match.group("to_unit").split(",")) if to_unit]
+            if not self._is_known_unit(from_unit) or not to_units:
+                return []
+            if to_units != ["*"] and not all(self._is_known_unit(to_unit) for to_unit in to_units):
+                return []
             try:
-                return self._get_items(
-                    float(match.group("from_amount")),
-                    match.group("from_unit").strip(),
-                    match.group("to_unit").strip(),
-                )
+                return self._get_items(float(match.group("from_amount")), from_unit, to_units)
             except Exception as error:
                 warning(f"Error: {error}")
                 tb = "".join(traceback.format_exception(error.__class__, error, error.__traceback__))
-                warning(tb)
+                debug(tb)
                 info("Something went wrong. Make sure you're using the correct format.")
         return []
 
     @staticmethod
-    def _create_item(text: str, subtext: str, icon: str = "") -> Item:
+    def _create_item(text: str, subtext: str, icon: str = "", to_unit: str = "") -> Item:
         """Create an Item from a text and subtext
 
         Args:
             text (str): The text to display
             subtext (str): The subtext to display
             icon (Optional[str]): The icon to display. If not specified, the default icon will be used
+            to_unit (Optional[str]): The unit converted to, distinguishes the items of one query
 
         Returns:
             Item: The item to be added to the list of results
         """
-        icon_path = Path(__file__).parent / "icons" / icon
-        if not icon or not icon_path.exists():
-            warning(f"Icon {icon} does not exist")
-            icon_path = Path(__file__).parent / "icons" / "unit_converter.svg"
+        icon_path = ICON_PATHS.get(icon, DEFAULT_ICON_PATH)
         return StandardItem(
-            id=str(icon_path),
-            iconUrls=["file:" + str(icon_path)],
+            id=f"{icon_path}:{to_unit}" if to_unit else icon_path,
+            iconUrls=["file:" + icon_path],
             text=text,
             subtext=subtext,
             actions=[
@@ -414,51 +955,100 @@ class Plugin(PluginInstance, GlobalQueryHandler):
             ],
         )
 
-    def _get_converter(self, from_unit: str, to_unit: str) -> UnitConverter:
+    def _get_completions(self, trigger: str, query_string: str, limit: int = 10) -> list[Item]:
+        """Generate completion items for a partially typed unit
+
+        Args:
+            trigger (str): The trigger of the query
+            query_string (str): The query string
+            limit (int): The maximum number of completions
+
+        Returns:
+            list[Item]: The completion items
+        """
+        if match := self.to_completion_regex.fullmatch(query_string):
+            separator = ""
+            from_unit = match.group("from_unit").strip()
+        elif match := self.from_completion_regex.fullmatch(query_string):
+            separator = " to "
+            from_unit = None
+        else:
+            return []
+
+        unit_converter = self.unit_converter
+        if unit_converter is None:
+            return []
+
+        head = match.group("head")
+        partial = match.group("partial")
+        currency_converter = self.currency_converter
+        currencies = currency_converter.complete_unit(partial, limit) if currency_converter else []
+        if from_unit and currency_converter and currency_converter.get_currency(from_unit) is not None:
+            completions = currencies
+        else:
+            completions = list(dict.fromkeys(unit_converter.complete_unit(partial, limit) + currencies))
+            completions = sorted(completions, key=lambda name: (len(name), name.lower()))[:limit]
+
+        return [
+            StandardItem(
+                id=f"complete_{completion}",
+                iconUrls=["file:" + DEFAULT_ICON_PATH],
+                text=completion,
+                subtext=f"Complete to '{head}{completion}{separator}'",
+                inputActionText=f"{trigger}{head}{completion}{separator}",
+            )
+            for completion in completions
+        ]
+
+    def _get_converter(self, from_unit: str, to_units: list[str]) -> UnitConverter:
         """Get the converter to use
 
         Args:
             from_unit (str): The unit to convert from
-            to_unit (str): The unit to convert to
+            to_units (list[str]): The units to convert to
 
         Returns:
             UnitConverter: The converter to use
         """
+        currency_converter = self.currency_converter
         if (
-            self.currency_converter.get_currency(from_unit) is not None
-            and self.currency_converter.get_currency(to_unit) is not None
+            currency_converter is not None
+            and currency_converter.get_currency(from_unit) is not None
+            and all(to_unit == "*" or currency_converter.get_currency(to_unit) is not None for to_unit in to_units)
         ):
-            return self.currency_converter
+            return currency_converter
         return self.unit_converter
 
-    def _get_items(self, amount: float, from_unit: str, to_unit: str) -> list[Item]:
+    def _get_items(self, amount: float, from_unit: str, to_units: list[str]) -> list[Item]:
         """Generate the Albert items to display for the query
 
         Args:
             amount (float): The amount to convert from
             from_unit (str): The unit to convert from
-            to_unit (str): The unit to convert to
+            to_units (list[str]): The units to convert to, ["*"] for all compatible units
 
         Returns:
             List[Item]: The list of items to display
         """
         try:
-            converter = self._get_converter(from_unit, to_unit)
-            result = converter.convert(amount, from_unit, to_unit)
-            # return the result
+            converter = self._get_converter(from_unit, to_units)
+            results = converter.convert_many(amount, from_unit, to_units)
+            # return the results
             return [
                 self._create_item(
                     result.formatted_result,
                     f"Converted from {result.formatted_from}",
                     result.icon,
+                    result.to_unit,
                 )
+                for result in results
             ]
         except pint.errors.DimensionalityError as e:
             warning(f"DimensionalityError: {e}")
-            return [self._create_item(f"Unable to convert {amount} {from_unit} to {to_unit}", str(e))]
+            return [self._create_item(f"Unable to convert {amount} {from_unit} to {', '.join(to_units)}", str(e))]
         except pint.errors.UndefinedUnitError as e:
-            warning(f"UndefinedUnitError: {e}")
+            debug(f"UndefinedUnitError: {e}")
             return []
         except UnknownCurrencyError as e:
-            warning(f"UnknownCurrencyError: {e}")
+            debug(f"UnknownCurrencyError: {e}")
             return []
@@ -2,26 +2,75 @@
 # Copyright (c) 2024 Sharsie
 
 import os
+import re
 import json
+import ctypes
+import select
+import sqlite3
+import struct
+import time
+import unicodedata
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from contextlib import closing
 from pathlib import Path
+from shutil import which
+from urllib.parse import unquote, urlparse
 from dataclasses import dataclass
+from threading import Event, Lock, Thread
 from albert import *
 
 md_iid = "3.0"
-md_version = "1.10"
+md_version = "1.19"
 md_name = "VSCode projects"
 md_description = "Open VSCode projects"
 md_url = "https://github.com/albertlauncher/python/tree/master/vscode_projects"
 md_license = "MIT"
-md_bin_dependencies = ["code"]
 md_authors = ["@Sharsie"]
 
-@dataclass
+@dataclass(frozen=True)
+class Flavor:
+    # Human readable name of the editor
+    name: str
+    # Directory of the configuration in ~/.config
+    configDir: str
+    # Command launching the editor
+    binary: str
+
+
+# Editors sharing the VSCode configuration layout, a project opened in several of them is opened in the first
+FLAVORS = [
+    Flavor(name="VSCode", configDir="Code", binary="code"),
+    Flavor(name="VSCode Insiders", configDir="Code - Insiders", binary="code-insiders"),
+    Flavor(name="Code - OSS", configDir="Code - OSS", binary="code-oss"),
+    Flavor(name="VSCodium", configDir="VSCodium", binary="codium"),
+    Flavor(name="Cursor", configDir="Cursor", binary="cursor"),
+]
+
+# Number of configuration files parsed concurrently
+MAX_LOAD_WORKERS = 4
+
+# Number of project paths checked for existence concurrently
+MAX_EXISTS_WORKERS = 4
+
+# Seconds a running existence check may take before the path is considered missing
+EXISTS_TIMEOUT = 2
+
+# Seconds the existence of a project path is cached
+EXISTS_TTL = 300
+
+
+@dataclass(frozen=True)
 class Project:
     displayName: str
     name: str
     path: str
-    tags: list[str]
+    # absolute path without "." and ".." parts, used to deduplicate projects until sym links are resolved
+    normalizedPath: str
+    tags: tuple[str, ...]
+    # editor whose configuration lists the project
+    flavor: Flavor
 
 
 @dataclass
@@ -33,25 +82,288 @@ class SearchResult:
     sortIndex: int
 
 
-@dataclass
+class ProjectIndex:
+    """Inverted index of the words in the names, paths and tags of projects
+
+    Narrows down the projects a query can match before the albert Matcher checks them. The Matcher
+    matches query words against prefixes of words, so the words are split on every non-alphanumeric
+    character, case folded and stripped of diacritics to never miss a project it would match.
+    """
+
+    SEPARATOR_REGEX = re.compile(r"[\W_]+")
+
+    def __init__(self, projects: tuple[Project, ...]):
+        rowsByWord: dict[str, set[int]] = {}
+        for row, proj in enumerate(projects):
+            for text in (proj.name, proj.path, proj.normalizedPath, *proj.tags):
+                for word in self.splitWords(text):
+                    rowsByWord.setdefault(word, set()).add(row)
+
+        self.size = len(projects)
+        self.words = sorted(rowsByWord)
+        self.rows = [rowsByWord[w] for w in self.words]
+
+    @classmethod
+    def splitWords(cls, text: str) -> list[str]:
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+        return [w for w in cls.SEPARATOR_REGEX.split(text.casefold()) if w]
+
+    # Returns the rows of the projects having a word starting with each word of the query, in order
+    def candidates(self, queryString: str) -> list[int]:
+        result: set[int] | None = None
+
+        for queryWord in self.splitWords(queryString):
+            matched: set[int] = set()
+            i = bisect_left(self.words, queryWord)
+            while i < len(self.words) and self.words[i].startswith(queryWord):
+                matched |= self.rows[i]
+                i += 1
+
+            result = matched if result is None else result & matched
+            if not result:
+                return []
+
+        return list(range(self.size)) if result is None else sorted(result)
+
+
+# Immutable snapshot of a parsed configuration, replaced as a whole when the file changes
+@dataclass(frozen=True)
 class CachedConfig:
-    projects: list[Project]
+    projects: tuple[Project, ...]
     mTime: float
+    index: ProjectIndex
+
+    @classmethod
+    def create(cls, projects: tuple[Project, ...], mTime: float) -> "CachedConfig":
+        return cls(projects, mTime, ProjectIndex(projects))
+
+
+# Seconds between checks of the configuration files when inotify is not available,
+# also how often missing configuration directories are looked for
+WATCH_POLL_INTERVAL = 5
+
+# inotify event flags, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+
+class Inotify:
+    """Minimal binding to the Linux inotify API"""
+
+    # Files written in place are reported on close, VSCode's write-to-temp-then-rename saves on move
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_ONLYDIR
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not supported on this platform")
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def addWatch(self, directory: str) -> int | None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        return wd if wd >= 0 else None
+
+    # Returns (watch descriptor, mask, file name) of the pending events, waits at most timeout seconds for them
+    def read(self, timeout: float) -> list[tuple[int, int, str]]:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ConfigWatcherThread(Thread):
+    """Calls back with the path of a configuration file whenever it may have changed
+
+    Watches the parent directories with inotify, so that files replaced by a rename are noticed too,
+    and falls back to polling the files where inotify is not available.
+    """
+
+    def __init__(self, paths: list[str], callback, polledPaths: list[str] | None = None):
+        super().__init__(daemon=True)
+        self.paths = paths
+        # Files modified in place through open handles, e.g. SQLite databases, which are polled in any case
+        self.polledPaths = polledPaths or []
+        self.callback = callback
+        self._stopEvent = Event()
+
+    def stop(self):
+        self._stopEvent.set()
+
+    def run(self):
+        # Different files are loaded concurrently, a file is never loaded by two workers at once
+        with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as pool:
+            self._pool = pool
+            try:
+                inotify = Inotify()
+            except OSError as e:
+                info(f"Polling the VSCode configuration, inotify is not available: {e}")
+                self._poll()
+                return
+
+            try:
+                self._watch(inotify)
+            finally:
+                inotify.close()
+
+    def _poll(self):
+        while True:
+            self._notifyAll(self.polledPaths + self.paths)
+
+            if self._stopEvent.wait(WATCH_POLL_INTERVAL):
+                return
+
+    def _watch(self, inotify: Inotify):
+        # Watched directories by watch descriptor
+        watched: dict[int, str] = {}
+
+        while not self._stopEvent.is_set():
+            # Loaded before the watched files, which may be skipped depending on them
+            self._notifyAll(self.polledPaths)
+            changed = set()
+
+            # Directories which do not exist yet are retried, e.g. when an extension gets installed later
+            for directory in {os.path.dirname(p) for p in self.paths}.difference(watched.values()):
+                wd = inotify.addWatch(directory)
+                if wd is not None:
+                    watched[wd] = directory
+                    # Load the files present before the watch was added
+                    changed.update(p for p in self.paths if os.path.dirname(p) == directory)
+
+            self._notifyAll(changed)
+            changed = set()
+
+            for wd, mask, name in inotify.read(WATCH_POLL_INTERVAL):
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.paths)
+                elif mask & IN_IGNORED:
+                    # The directory was removed
+                    watched.pop(wd, None)
+                elif wd in watched:
+                    path = os.path.join(watched[wd], name)
+                    if path in self.paths:
+                        changed.add(path)
+
+            self._notifyAll(changed)
+
+    def _notifyAll(self, paths):
+        # Wait for all of them, so the next round cannot load the same file concurrently
+        for _ in self._pool.map(self._notify, paths):
+            pass
+
+    def _notify(self, path: str):
+        try:
+            self.callback(path)
+        except Exception as e:
+            warning(f"Failed to load {path}: {e}")
+
+
+class PathValidator:
+    """Checks in the background whether project paths exist
+
+    Stale entries on unmounted network shares can block os.path.exists and resolving sym links for
+    seconds, so the checks run on a bounded number of daemon threads, which cannot block albert's exit
+    when a check hangs, and the results are cached. A path is reported as unknown until it was checked,
+    and as missing while its running check hangs for longer than the timeout.
+    """
+
+    def __init__(self):
+        self._queue: Queue[str | None] = Queue()
+        self._stopEvent = Event()
+        # Path with sym links resolved, None if missing, and monotonic time of the check by path
+        self._results: dict[str, tuple[str | None, float]] = {}
+        # Paths queued or being checked
+        self._pending: set[str] = set()
+        # Monotonic time the running checks started by path
+        self._started: dict[str, float] = {}
+
+        for _ in range(MAX_EXISTS_WORKERS):
+            Thread(target=self._work, daemon=True).start()
+
+    # Returns whether the path exists, None if not known yet
+    def exists(self, path: str) -> bool | None:
+        now = time.monotonic()
+        result = self._results.get(path)
+        if result is not None and now - result[1] < EXISTS_TTL:
+            return result[0] is not None
+
+        if path not in self._pending:
+            # A hanging path is never checked twice at once, so it can block one worker at most
+            self._pending.add(path)
+            self._queue.put(path)
+        elif (started := self._started.get(path)) is not None and now - started > EXISTS_TIMEOUT:
+            return False
+
+        # The outdated result is used until the path has been checked again
+        return None if result is None else result[0] is not None
+
+    # Returns the path with sym links resolved, None if it was not checked yet or is missing
+    def resolvedPath(self, path: str) -> str | None:
+        result = self._results.get(path)
+        return None if result is None else result[0]
+
+    # Starts checking the paths, so that results are ready for the next query
+    def prefetch(self, paths: list[str]):
+        for path in paths:
+            self.exists(path)
+
+    def _work(self):
+        while (path := self._queue.get()) is not None and not self._stopEvent.is_set():
+            self._started[path] = time.monotonic()
+            resolvedPath = os.path.realpath(path) if os.path.exists(path) else None
+            self._results[path] = (resolvedPath, time.monotonic())
+            self._started.pop(path, None)
+            self._pending.discard(path)
+
+    def shutdown(self):
+        self._stopEvent.set()
+        for _ in range(MAX_EXISTS_WORKERS):
+            self._queue.put(None)
+
+
+# Returns the location of a configuration file of each flavor
+def configPaths(relativePath: str, flavors: list[Flavor]) -> dict[str, Flavor]:
+    return {
+        os.path.join(os.environ["HOME"], ".config", flavor.configDir, relativePath): flavor
+        for flavor in flavors
+    }
 
 
 class Plugin(PluginInstance, TriggerQueryHandler):
+    # Flavors whose binary is installed
+    _flavors: list[Flavor]
+
     # Possible locations for Code configuration
-    _configStoragePaths = [
-        os.path.join(os.environ["HOME"], ".config/Code/storage.json"),
-        os.path.join(os.environ["HOME"],
-                     ".config/Code/User/globalStorage/storage.json"),
-    ]
+    _configStoragePaths: dict[str, Flavor]
+
+    # Possible locations for the VSCode state database holding the recently opened list, preferred over storage.json
+    _configStateDbPaths: dict[str, Flavor]
 
     # Possible locations for Project Manager extension configuration
-    _configProjectManagerPaths = [
-        os.path.join(
-            os.environ["HOME"], ".config/Code/User/globalStorage/alefragnani.project-manager/projects.json")
-    ]
+    _configProjectManagerPaths: dict[str, Flavor]
 
     # Indicates whether results from the Recent list in VSCode should be searched
     _recentEnabled = True
@@ -68,7 +380,11 @@ class Plugin(PluginInstance, TriggerQueryHandler):
     }
 
     # Holds cached data from the json configurations
-    _configCache: dict[str, CachedConfig] = {}
+    _configCache: dict[str, CachedConfig]
+
+    # Projects of all configurations merged, searched by queries
+    _recentProjects: CachedConfig
+    _projectManagerProjects: CachedConfig
 
     # Overrides the command to open projects
     _terminalCommand = ""
@@ -166,14 +482,31 @@ class Plugin(PluginInstance, TriggerQueryHandler):
 
     def __init__(self):
         self.iconUrls = [f"file:{Path(__file__).parent}/icon.svg"]
+        self._configCache = {}
+        self._recentProjects = CachedConfig.create((), 0)
+        self._projectManagerProjects = CachedConfig.create((), 0)
+        self._mergeLock = Lock()
+        self._pathValidator = PathValidator()
 
         PluginInstance.__init__(self)
 
         TriggerQueryHandler.__init__(self)
 
+        self._flavors = [f for f in FLAVORS if which(f.binary)]
+        if not self._flavors:
+            warning("Could not find any VSCode binary: " + ", ".join(f.binary for f in FLAVORS))
+
+        self._configStoragePaths = {
+            **configPaths("storage.json", self._flavors),
+            **configPaths("User/globalStorage/storage.json", self._flavors),
+        }
+        self._configStateDbPaths = configPaths("User/globalStorage/state.vscdb", self._flavors)
+        self._configProjectManagerPaths = configPaths(
+            "User/globalStorage/alefragnani.project-manager/projects.json", self._flavors)
+
         configFound = False
 
-        for p in self._configStoragePaths:
+        for p in [*self._configStoragePaths, *self._configStateDbPaths]:
             if os.path.exists(p):
                 configFound = True
                 break
@@ -183,6 +516,16 @@ class Plugin(PluginInstance, TriggerQueryHandler):
 
         self._initConfiguration()
 
+        # Configurations are (re)loaded in the background, queries only read the current snapshots
+        self._watcher = ConfigWatcherThread(
+            [*self._configStoragePaths, *self._configProjectManagerPaths], self._reloadConfig,
+            polledPaths=list(self._configStateDbPaths))
+        self._watcher.start()
+
+    def __del__(self):
+        self._watcher.stop()
+        self._pathValidator.shutdown()
+
     def configWidget(self):
         return [
             {
@@ -313,13 +656,13 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
         results: dict[str, SearchResult] = {}
 
         if self.recentEnabled:
-            results = self._searchInRecentFiles(matcher, results)
+            results = self._searchInRecentFiles(matcher, query.string, results)
 
         if self.projectManagerEnabled:
-            results = self._searchInProjectManager(matcher, results)
+            results = self._searchInProjectManager(matcher, query.string, results)
 
-        sortedItems = sorted(results.values(), key=lambda item: "%s_%s_%s" % (
-            '{:03d}'.format(item.priority), '{:03d}'.format(item.sortIndex), item.project.name), reverse=False)
+        sortedItems = sorted(results.values(), key=lambda item: (
+            item.priority, item.sortIndex, item.project.name))
 
         items: list[StandardItem] = []
         for i in sortedItems:
@@ -343,9 +686,9 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
         actions.append(
             Action(
                 id="open-code",
-                text="Open with VSCode",
+                text=f"Open with {project.flavor.name}",
                 callable=lambda: runDetachedProcess(
-                    ["code", project.path]),
+                    [project.flavor.binary, project.path]),
             )
         )
 
@@ -363,66 +706,75 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
             actions=actions,
         )
 
-    def _searchInRecentFiles(self, matcher: Matcher, results: dict[str, SearchResult]) -> dict[str, SearchResult]:
+    def _searchInRecentFiles(self, matcher: Matcher, queryString: str, results: dict[str, SearchResult]) -> dict[str, SearchResult]:
         sortIndex = 1
 
-        for path in self._configStoragePaths:
-            c = self._getStorageConfig(path)
-            for proj in c.projects:
-                # Resolve sym links to get unique results
-                resolvedPath = str(Path(proj.path).resolve())
-                if matcher.match(proj.name) or matcher.match(proj.path) or matcher.match(resolvedPath):
-                    results[resolvedPath] = self._getHigherPriorityResult(
-                        SearchResult(
-                            project=proj,
-                            priority=self.priorityRecent,
-                            sortIndex=sortIndex
-                        ),
-                        results.get(resolvedPath),
-                    )
+        c = self._recentProjects
+        for row in c.index.candidates(queryString):
+            proj = c.projects[row]
+            # Projects not checked yet are shown until they turn out to be missing
+            if self._pathValidator.exists(proj.path) is False:
+                continue
+
+            # Sym links are resolved by the validator once the path was checked
+            resolvedPath = self._pathValidator.resolvedPath(proj.path) or proj.normalizedPath
+            if matcher.match(proj.name) or matcher.match(proj.path) or matcher.match(resolvedPath):
+                results[resolvedPath] = self._getHigherPriorityResult(
+                    SearchResult(
+                        project=proj,
+                        priority=self.priorityRecent,
+                        sortIndex=sortIndex
+                    ),
+                    results.get(resolvedPath),
+                )
 
-                if results.get(resolvedPath) is not None:
-                    sortIndex += 1
+            if results.get(resolvedPath) is not None:
+                sortIndex += 1
 
         return results
 
-    def _searchInProjectManager(self, matcher: Matcher, results: dict[str, SearchResult]) -> dict[str, SearchResult]:
-        for path in self._configProjectManagerPaths:
-            c = self._getProjectManagerConfig(path)
-            for proj in c.projects:
-                # Resolve sym links to get unique results
-                resolvedPath = str(Path(proj.path).resolve())
-                if matcher.match(proj.name):
-                    results[resolvedPath] = self._getHigherPriorityResult(
-                        SearchResult(
-                            project=proj,
-                            priority=self.priorityPMName,
-                            sortIndex=0 if matcher.match(proj.name).isExactMatch() else 1
-                        ),
-                        results.get(resolvedPath),
-                    )
+    def _searchInProjectManager(self, matcher: Matcher, queryString: str, results: dict[str, SearchResult]) -> dict[str, SearchResult]:
+        c = self._projectManagerProjects
+        for row in c.index.candidates(queryString):
+            proj = c.projects[row]
+            # Projects not checked yet are shown until they turn out to be missing
+            if self._pathValidator.exists(proj.path) is False:
+                continue
+
+            # Sym links are resolved by the validator once the path was checked
+            resolvedPath = self._pathValidator.resolvedPath(proj.path) or proj.normalizedPath
+            nameMatch = matcher.match(proj.name)
+            if nameMatch:
+                results[resolvedPath] = self._getHigherPriorityResult(
+                    SearchResult(
+                        project=proj,
+                        priority=self.priorityPMName,
+                        sortIndex=0 if nameMatch.isExactMatch() else 1
+                    ),
+                    results.get(resolvedPath),
+                )
 
-                if matcher.match(proj.path) or matcher.match(resolvedPath):
+            if matcher.match(proj.path) or matcher.match(resolvedPath):
+                results[resolvedPath] = self._getHigherPriorityResult(
+                    SearchResult(
+                        project=proj,
+                        priority=self.priorityPMPath,
+                        sortIndex=1
+                    ),
+                    results.get(resolvedPath),
+                )
+
+            for tag in proj.tags:
+                if matcher.match(tag):
                     results[resolvedPath] = self._getHigherPriorityResult(
                         SearchResult(
                             project=proj,
-                            priority=self.priorityPMPath,
+                            priority=self.priorityPMTag,
                             sortIndex=1
                         ),
                         results.get(resolvedPath),
                     )
-
-                for tag in proj.tags:
-                    if matcher.match(tag):
-                        results[resolvedPath] = self._getHigherPriorityResult(
-                            SearchResult(
-                                project=proj,
-                                priority=self.priorityPMTag,
-                                sortIndex=1
-                            ),
-                            results.get(resolvedPath),
-                        )
-                        break
+                    break
 
         return results
 
@@ -434,8 +786,115 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
 
         return prev
 
+    # Called by the watcher when a configuration file may have changed, possibly concurrently for different files
+    def _reloadConfig(self, path: str):
+        previous = self._configCache.get(path)
+
+        if path in self._configStateDbPaths:
+            c = self._getStateDbConfig(path)
+            if c is None and previous is not None:
+                # Load the fallback when the database is not available anymore
+                for p in self._storagePathsOf(self._configStateDbPaths[path]):
+                    self._getStorageConfig(p)
+            if c is not previous:
+                self._mergeRecentProjects()
+        elif path in self._configStoragePaths:
+            # The large storage.json is not parsed when the state database of the flavor is used
+            if not self._stateDbPathsOf(self._configStoragePaths[path]):
+                self._getStorageConfig(path)
+                if self._configCache.get(path) is not previous:
+                    self._mergeRecentProjects()
+        else:
+            self._getProjectManagerConfig(path)
+            if self._configCache.get(path) is not previous:
+                self._mergeProjectManagerProjects()
+
+    # Loaded state databases of the flavor
+    def _stateDbPathsOf(self, flavor: Flavor) -> list[str]:
+        return [p for p, f in self._configStateDbPaths.items() if f == flavor and p in self._configCache]
+
+    def _storagePathsOf(self, flavor: Flavor) -> list[str]:
+        return [p for p, f in self._configStoragePaths.items() if f == flavor]
+
+    # Merges the configurations into one snapshot, projects listed by several of them are kept once
+    def _mergeConfigs(self, paths: list[str]) -> CachedConfig:
+        projects: dict[str, Project] = {}
+        for path in paths:
+            c = self._configCache.get(path)
+            if c is not None:
+                for proj in c.projects:
+                    projects.setdefault(proj.normalizedPath, proj)
+
+        return CachedConfig.create(tuple(projects.values()), 0)
+
+    # Merging is serialized, so the last merge sees every loaded configuration
+    def _mergeRecentProjects(self):
+        with self._mergeLock:
+            paths = [p for f in self._flavors for p in self._stateDbPathsOf(f) or self._storagePathsOf(f)]
+            self._recentProjects = self._mergeConfigs(paths)
+            self._pathValidator.prefetch([proj.path for proj in self._recentProjects.projects])
+
+    def _mergeProjectManagerProjects(self):
+        with self._mergeLock:
+            self._projectManagerProjects = self._mergeConfigs(list(self._configProjectManagerPaths))
+            self._pathValidator.prefetch([proj.path for proj in self._projectManagerProjects.projects])
+
+    # Creates a project for a recently opened folder
+    def _createRecentProject(self, recentPath: str, flavor: Flavor) -> Project:
+        displayName = recentPath.split("/")[-1]
+
+        return Project(
+            displayName=displayName,
+            name=displayName,
+            path=recentPath,
+            # Resolving sym links may hang on stale mounts, it is left to the path validator
+            normalizedPath=os.path.abspath(recentPath),
+            tags=(),
+            flavor=flavor,
+        )
+
+    # Reads the recently opened folders from the state database, None if it has none
+    def _getStateDbConfig(self, path: str) -> CachedConfig | None:
+        # The database changes through its write-ahead log while VSCode is running
+        mTimes = [os.stat(p).st_mtime for p in (path, path + "-wal") if os.path.exists(p)]
+        if not mTimes or not os.path.exists(path):
+            self._configCache.pop(path, None)
+            return None
+
+        mTime = max(mTimes)
+        c = self._configCache.get(path)
+        if c is not None and mTime == c.mTime:
+            return c
+
+        # Open read-only, only the recently opened list is fetched
+        with closing(sqlite3.connect(f"{Path(path).as_uri()}?mode=ro", uri=True, timeout=1)) as db:
+            row = db.execute(
+                "SELECT value FROM ItemTable WHERE key = ?", ("history.recentlyOpenedPathsList",)).fetchone()
+
+        if row is None:
+            self._configCache.pop(path, None)
+            return None
+
+        # Projects keyed by normalized path, first occurrence wins
+        projects: dict[str, Project] = {}
+
+        for entry in json.loads(row[0]).get("entries", []):
+            # Workspaces and files are listed too, only local folders are projects
+            uri = urlparse(entry.get("folderUri", ""))
+            if uri.scheme != "file":
+                continue
+
+            recentPath = unquote(uri.path)
+            project = self._createRecentProject(recentPath, self._configStateDbPaths[path])
+            projects.setdefault(project.normalizedPath, project)
+
+        c = CachedConfig.create(tuple(projects.values()), mTime)
+        self._configCache[path] = c
+
+        return c
+
     def _getStorageConfig(self, path: str) -> CachedConfig:
-        c: CachedConfig = self._configCache.get(path, CachedConfig([], 0))
+        c: CachedConfig = self._configCache.get(path, CachedConfig.create((), 0))
 
         if not os.path.exists(path):
             return c
@@ -445,7 +904,8 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
         if mTime == c.mTime:
             return c
 
-        c.mTime = mTime
+        # Projects keyed by normalized path, first occurrence wins
+        projects: dict[str, Project] = {}
 
         with open(path) as configFile:
             # Load the storage json
@@ -483,25 +943,19 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
 
                         # Get the full path to the project
                         recentPath = submenuItem["uri"]["path"]
-                        if not os.path.exists(recentPath):
-                            continue
-
-                        displayName = recentPath.split("/")[-1]
 
                         # Inject the project
-                        c.projects.append(Project(
-                            displayName=displayName,
-                            name=displayName,
-                            path=recentPath,
-                            tags=[],
-                        ))
+                        project = self._createRecentProject(recentPath, self._configStoragePaths[path])
+                        projects.setdefault(project.normalizedPath, project)
 
+        # Swap in the new snapshot, readers keep whichever one they already got
+        c = CachedConfig.create(tuple(projects.values()), mTime)
         self._configCache[path] = c
 
         return c
 
     def _getProjectManagerConfig(self, path: str) -> CachedConfig:
-        c = self._configCache.get(path, CachedConfig([], 0))
+        c = self._configCache.get(path, CachedConfig.create((), 0))
 
         if not os.path.exists(path):
             return c
@@ -511,7 +965,8 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
         if mTime == c.mTime:
             return c
 
-        c.mTime = mTime
+        # Projects keyed by normalized path, first occurrence wins
+        projects: dict[str, Project] = {}
 
         with open(path) as configFile:
             configuredProjects = json.loads(configFile.read())
@@ -528,23 +983,22 @@ Usecase with single VSCode instance - To reuse the VSCode window instead of open
 
                 # Grab the path to the project
                 rootPath = p["rootPath"]
-                if os.path.exists(rootPath) == False:
-                    continue
 
-                project = Project(
+                # Resolving sym links may hang on stale mounts, it is left to the path validator
+                normalizedPath = os.path.abspath(rootPath)
+
+                projects.setdefault(normalizedPath, Project(
                     displayName=p["name"],
                     name=p["name"],
                     path=rootPath,
-                    tags=[],
-                )
-
-                # Search against the query string
-                if "tags" in p:
-                    for tag in p["tags"]:
-                        project.tags.append(tag)
-
-                c.projects.append(project)
-
+                    normalizedPath=normalizedPath,
+                    # Search against the query string
+                    tags=tuple(p.get("tags", [])),
+                    flavor=self._configProjectManagerPaths[path],
+                ))
+
+        # Swap in the new snapshot, readers keep whichever one they already got
+        c = CachedConfig.create(tuple(projects.values()), mTime)
         self._configCache[path] = c
 
         return c